@@ -1,9 +1,68 @@
-from datetime import date, datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from typing import List, Tuple
 
 import caldav
 from caldav.lib import error as caldav_error
-from icalendar import Calendar, Event
+from requests.adapters import HTTPAdapter
+
+CALDAV_POOL_MAXSIZE = 8
+CALDAV_MAX_WORKERS = 4
+ICAL_LINE_LIMIT_OCTETS = 75
+
+# Every event has the same fixed shape, so the payload is formatted directly
+# instead of going through an icalendar object graph.
+ICAL_EVENT_TEMPLATE = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//power-outage-scraper//EN\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:{uid}\r\n"
+    "DTSTAMP:{dtstamp}\r\n"
+    "SUMMARY:{summary}\r\n"
+    "DTSTART:{dtstart}\r\n"
+    "DTEND:{dtend}\r\n"
+    "DESCRIPTION:{description}\r\n"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+
+def _ical_text(value: str) -> str:
+    return (
+        value.replace("\r\n", "\n")
+        .replace("\r", "\n")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _ical_fold(line: str) -> str:
+    # RFC 5545 limits content lines to 75 octets; continuation lines start
+    # with a space and splits must not fall inside a UTF-8 sequence.
+    if len(line.encode("utf-8")) <= ICAL_LINE_LIMIT_OCTETS:
+        return line
+
+    parts: List[str] = []
+    current: List[str] = []
+    size = 0
+    for ch in line:
+        octets = len(ch.encode("utf-8"))
+        if size + octets > ICAL_LINE_LIMIT_OCTETS:
+            parts.append("".join(current))
+            current = []
+            size = 1
+        current.append(ch)
+        size += octets
+    parts.append("".join(current))
+    return "\r\n ".join(parts)
+
+
+def _ical_utc(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
 
 
 class CalendarSyncError(Exception):
@@ -21,10 +80,28 @@ class AppleCalendarSync:
         if not user or not password:
             raise CalendarSyncError("CALDAV_USER and CALDAV_PASSWORD are required")
         self.client = caldav.DAVClient(url=url, username=user, password=password)
+        # Keep TLS connections alive across searches, deletes and adds.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=CALDAV_POOL_MAXSIZE)
+        self.client.session.mount("https://", adapter)
+        self.client.session.mount("http://", adapter)
+        self.client.session.headers["Connection"] = "keep-alive"
         self.calendar_name = calendar_name
         self.event_prefix = event_prefix
+        self._calendar = None
+        self._calendar_lock = threading.Lock()
 
     def _get_calendar(self):
+        with self._calendar_lock:
+            if self._calendar is None:
+                self._calendar = self._find_calendar()
+            return self._calendar
+
+    def _invalidate_calendar(self) -> None:
+        # Only called for auth/unavailable errors, so the next call re-resolves.
+        with self._calendar_lock:
+            self._calendar = None
+
+    def _find_calendar(self):
         try:
             principal = self.client.principal()
             for cal in principal.calendars():
@@ -47,15 +124,16 @@ class AppleCalendarSync:
         title = f"{self.event_prefix} (Queue {queue})"
         uid = f"poweroutage-{queue}-{day.isoformat()}-{start_dt.strftime('%H%M')}-{end_dt.strftime('%H%M')}"
 
-        cal = Calendar()
-        event = Event()
-        event.add("uid", uid)
-        event.add("summary", title)
-        event.add("dtstart", start_dt)
-        event.add("dtend", end_dt)
-        event.add("description", f"Scheduled outage for queue {queue}")
-        cal.add_component(event)
-        return cal.to_ical()
+        payload = ICAL_EVENT_TEMPLATE.format(
+            uid=uid,
+            dtstamp=_ical_utc(datetime.now(timezone.utc)),
+            summary=_ical_text(title),
+            dtstart=_ical_utc(start_dt),
+            dtend=_ical_utc(end_dt),
+            description=_ical_text(f"Scheduled outage for queue {queue}"),
+        )
+        lines = (_ical_fold(line) for line in payload.split("\r\n"))
+        return "\r\n".join(lines).encode("utf-8")
 
     def replace_day_events(
         self, day: date, queue: str, ranges: List[Tuple[datetime, datetime]]
@@ -67,24 +145,36 @@ class AppleCalendarSync:
         day_end = day_start + timedelta(days=1)
 
         try:
-            existing = calendar.date_search(day_start, day_end)
-            for e in existing:
-                data = e.data
-                if isinstance(data, bytes):
-                    haystack = data.decode("utf-8", errors="replace")
-                else:
-                    haystack = str(data)
-                if title in haystack:
-                    e.delete()
-
-            created = 0
-            for start_dt, end_dt in ranges:
-                event_payload = self._build_event(day, start_dt, end_dt, queue)
-                calendar.add_event(event_payload)
-                created += 1
+            # No server-side summary text-match: iCloud does not handle it
+            # reliably, and the REPORT already returns each event's data.
+            candidates = calendar.search(
+                start=day_start, end=day_end, event=True, expand=False
+            )
+            # Compare the parsed SUMMARY: the raw payload is escaped and folded.
+            existing = [
+                e
+                for e in candidates
+                if str(e.icalendar_component.get("summary", "")) == title
+            ]
+            payloads = [
+                self._build_event(day, start_dt, end_dt, queue)
+                for start_dt, end_dt in ranges
+            ]
+
+            # Deletes and adds are each independent, so both overlap on the
+            # pooled connections. Adds only start once every stale event is
+            # gone, since a new event may reuse a deleted event's href.
+            with ThreadPoolExecutor(max_workers=CALDAV_MAX_WORKERS) as pool:
+                list(pool.map(lambda e: e.delete(), existing))
+                list(pool.map(calendar.add_event, payloads))
+            created = len(payloads)
+        except caldav_error.AuthorizationError as exc:
+            self._invalidate_calendar()
+            raise CalendarSyncError("CalDAV authorization failed") from exc
         except Exception as exc:
             message = str(exc)
             if "503" in message or "Service Unavailable" in message:
+                self._invalidate_calendar()
                 raise CalendarServiceUnavailable(
                     f"CalDAV service unavailable while syncing date {day.isoformat()}"
                 ) from exc
@@ -1,4 +1,6 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime, timedelta
 
 from calendar_sync import (
@@ -7,11 +9,14 @@ from calendar_sync import (
     CalendarSyncError,
 )
 from config import load_config
-from notifier import NotificationError, send_schedule_update_email
+from notifier import NotificationError, SmtpNotifier
 from parser import (
     ParseError,
     ScheduleSnapshot,
-    fetch_snapshot_rendered,
+    close_browser,
+    fetch_rendered_html,
+    html_fingerprint,
+    parse_snapshots,
     pick_queue_ranges,
 )
 from state import load_state, save_state
@@ -21,6 +26,9 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s",
 )
 
+SYNC_MAX_WORKERS = 2
+NOTIFY_MAX_WORKERS = 1
+
 
 def _to_datetime_ranges(day, time_ranges, tz):
     out = []
@@ -63,9 +71,41 @@ def _clear_day_events(sync: AppleCalendarSync, day, queue: str) -> None:
     )
 
 
+def _sync_day(sync: AppleCalendarSync, cfg, day, snapshot, prev_fp):
+    day_key = day.isoformat()
+    if prev_fp == snapshot.fingerprint:
+        logging.info("No changes for %s. State fingerprint unchanged.", day_key)
+        return None
+
+    ranges = pick_queue_ranges(snapshot, cfg.outage_queue)
+    dt_ranges = _to_datetime_ranges(day, ranges, cfg.timezone)
+    created = sync.replace_day_events(day, cfg.outage_queue, dt_ranges)
+    logging.info(
+        "Calendar updated for %s, queue %s. Created events: %d",
+        day,
+        cfg.outage_queue,
+        created,
+    )
+    return day_key, snapshot.fingerprint, dt_ranges
+
+
+def _wait_for_notifications(notifications, to_email: str) -> None:
+    for day, future in notifications:
+        try:
+            # Bounded by the SMTP socket timeout in SmtpNotifier.
+            future.result()
+            logging.info("Sent schedule update email for %s to %s", day, to_email)
+        except NotificationError as exc:
+            logging.error("Notification error: %s", exc)
+        except Exception:
+            # Never let a notification bug mask the sync outcome.
+            logging.exception("Unexpected error sending email for %s", day)
+
+
 def run_once() -> None:
     cfg = load_config()
     state = load_state(cfg.state_file)
+    loaded_state = replace(state, by_day_fingerprint=dict(state.by_day_fingerprint))
 
     logging.info(
         "Starting scraper queue=%s source=%s calendar=%s",
@@ -85,98 +125,118 @@ def run_once() -> None:
         event_prefix=cfg.event_prefix,
     )
 
+    html = fetch_rendered_html(
+        cfg.source_url,
+        chromium_executable=cfg.chromium_executable,
+        launch_timeout_ms=cfg.chromium_launch_timeout_ms,
+    )
+    # Scoped to today so the day rollover is still processed on an unchanged page.
+    page_fp = f"{today_key}:{html_fingerprint(html)}"
+    if page_fp == state.page_fingerprint:
+        logging.info("Source page unchanged since last run. Skipping sync.")
+        return
+
     try:
-        snapshots = fetch_snapshot_rendered(
-            cfg.source_url,
-            chromium_executable=cfg.chromium_executable,
-            launch_timeout_ms=cfg.chromium_launch_timeout_ms,
-        )
+        snapshots = parse_snapshots(html)
     except ParseError as exc:
         msg = str(exc)
-        if "No '.power-off__text' schedule blocks found in rendered HTML" in msg:
-            logging.info(
-                "No schedule blocks on source page. Clearing today's queue events."
-            )
-            _clear_day_events(sync, now, cfg.outage_queue)
-            state.by_day_fingerprint.pop(today_key, None)
-            save_state(cfg.state_file, state)
-            return
-        raise
+        if "No '.power-off__text' schedule blocks found in rendered HTML" not in msg:
+            raise
+        logging.info("No schedule blocks on source page.")
+        snapshots = []
 
     if cfg.log_extracted_events:
         _log_extracted_events(snapshots)
 
     allowed_days = {now, now + timedelta(days=1)}
 
-    day_snapshots = [s for s in snapshots if s.applicable_date in allowed_days]
-    if not day_snapshots:
-        logging.info("No schedule blocks for today/tomorrow. Clearing today's events.")
-        _clear_day_events(sync, now, cfg.outage_queue)
-        state.by_day_fingerprint.pop(today_key, None)
-        save_state(cfg.state_file, state)
-        return
-
     # If multiple blocks exist for same day, use the most recently updated one.
     latest_by_day = {}
-    for snap in day_snapshots:
+    for snap in snapshots:
+        if snap.applicable_date not in allowed_days:
+            continue
         prev = latest_by_day.get(snap.applicable_date)
         if prev is None or snap.updated_at >= prev.updated_at:
             latest_by_day[snap.applicable_date] = snap
 
-    if now not in latest_by_day:
-        logging.info("No schedule for today. Clearing today's events.")
-        _clear_day_events(sync, now, cfg.outage_queue)
-        state.by_day_fingerprint.pop(today_key, None)
-
-    for day in sorted(latest_by_day.keys()):
-        snapshot = latest_by_day[day]
-        day_key = day.isoformat()
-        prev_fp = state.by_day_fingerprint.get(day_key)
-        if prev_fp == snapshot.fingerprint:
-            logging.info("No changes for %s. State fingerprint unchanged.", day_key)
-            continue
-
-        ranges = pick_queue_ranges(snapshot, cfg.outage_queue)
-        dt_ranges = _to_datetime_ranges(day, ranges, cfg.timezone)
-        created = sync.replace_day_events(day, cfg.outage_queue, dt_ranges)
-        logging.info(
-            "Calendar updated for %s, queue %s. Created events: %d",
-            day,
-            cfg.outage_queue,
-            created,
-        )
-        if cfg.notify_email_to:
-            try:
-                send_schedule_update_email(
-                    smtp_host=cfg.smtp_host,
-                    smtp_port=cfg.smtp_port,
-                    smtp_user=cfg.smtp_user,
-                    smtp_password=cfg.smtp_password,
-                    smtp_use_tls=cfg.smtp_use_tls,
-                    to_email=cfg.notify_email_to,
-                    from_email=cfg.notify_email_from,
-                    schedule_day=day,
-                    queue=cfg.outage_queue,
-                    updated_at=snapshot.updated_at,
-                    ranges=dt_ranges,
-                )
-                logging.info(
-                    "Sent schedule update email for %s to %s",
-                    day,
-                    cfg.notify_email_to,
-                )
-            except NotificationError as exc:
-                logging.error("Notification error: %s", exc)
-
-        state.by_day_fingerprint[day_key] = snapshot.fingerprint
-
-    # Keep small state: today and tomorrow only.
-    today = now.isoformat()
-    tomorrow = (now + timedelta(days=1)).isoformat()
-    state.by_day_fingerprint = {
-        k: v for k, v in state.by_day_fingerprint.items() if k in {today, tomorrow}
-    }
-    save_state(cfg.state_file, state)
+    # Emails go out one at a time on a single background worker sharing one
+    # SMTP session, so SMTP does not hold up calendar sync.
+    notifier = SmtpNotifier(
+        host=cfg.smtp_host,
+        port=cfg.smtp_port,
+        user=cfg.smtp_user,
+        password=cfg.smtp_password,
+        use_tls=cfg.smtp_use_tls,
+    )
+    with notifier, ThreadPoolExecutor(max_workers=NOTIFY_MAX_WORKERS) as notify_pool:
+        notifications = []
+        try:
+            if now not in latest_by_day:
+                logging.info("No schedule for today. Clearing today's events.")
+                _clear_day_events(sync, now, cfg.outage_queue)
+                state.by_day_fingerprint.pop(today_key, None)
+
+            # Days touch disjoint events, so they sync concurrently over the
+            # shared CalDAV session. Every day finishes before errors surface.
+            with ThreadPoolExecutor(max_workers=SYNC_MAX_WORKERS) as sync_pool:
+                futures = [
+                    (
+                        day,
+                        sync_pool.submit(
+                            _sync_day,
+                            sync,
+                            cfg,
+                            day,
+                            latest_by_day[day],
+                            state.by_day_fingerprint.get(day.isoformat()),
+                        ),
+                    )
+                    for day in sorted(latest_by_day.keys())
+                ]
+
+            first_error = None
+            for day, future in futures:
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    if first_error is None:
+                        first_error = exc
+                    continue
+                if result is None:
+                    continue
+
+                day_key, fingerprint, dt_ranges = result
+                state.by_day_fingerprint[day_key] = fingerprint
+                if cfg.notify_email_to:
+                    notifications.append(
+                        (
+                            day,
+                            notify_pool.submit(
+                                notifier.send_schedule_update,
+                                to_email=cfg.notify_email_to,
+                                from_email=cfg.notify_email_from,
+                                schedule_day=day,
+                                queue=cfg.outage_queue,
+                                updated_at=latest_by_day[day].updated_at,
+                                ranges=dt_ranges,
+                            ),
+                        )
+                    )
+            if first_error is not None:
+                raise first_error
+
+            state.page_fingerprint = page_fp
+        finally:
+            # Keep small state: today and tomorrow only. Days synced before a
+            # failure are still recorded so they are not redone next cycle.
+            kept_keys = {today_key, (now + timedelta(days=1)).isoformat()}
+            for key in list(state.by_day_fingerprint):
+                if key not in kept_keys:
+                    del state.by_day_fingerprint[key]
+            if state != loaded_state:
+                save_state(cfg.state_file, state)
+
+            _wait_for_notifications(notifications, cfg.notify_email_to)
 
 
 if __name__ == "__main__":
@@ -191,3 +251,5 @@ if __name__ == "__main__":
     except Exception:
         logging.exception("Unexpected error")
         raise
+    finally:
+        close_browser()
@@ -1,4 +1,5 @@
 import smtplib
+import threading
 from datetime import date, datetime
 from email.message import EmailMessage
 
@@ -7,70 +8,110 @@ class NotificationError(Exception):
     pass
 
 
-def send_schedule_update_email(
-    *,
-    smtp_host: str,
-    smtp_port: int,
-    smtp_user: str,
-    smtp_password: str,
-    smtp_use_tls: bool,
-    to_email: str,
-    from_email: str,
-    schedule_day: date,
-    queue: str,
-    updated_at: datetime,
-    ranges: list[tuple[datetime, datetime]],
-) -> None:
-    if not smtp_host:
-        raise NotificationError("SMTP_HOST is required when NOTIFY_EMAIL_TO is set")
-    if not to_email:
-        raise NotificationError("NOTIFY_EMAIL_TO is required for notifications")
+# Keeps one SMTP session for all emails sent during a run. The connection is
+# opened on the first send, so runs without updates never touch SMTP.
+class SmtpNotifier:
+    def __init__(
+        self, *, host: str, port: int, user: str, password: str, use_tls: bool
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self._server = None
+        self._lock = threading.Lock()
 
-    sender = from_email or smtp_user
-    if not sender:
-        raise NotificationError(
-            "NOTIFY_EMAIL_FROM or SMTP_USER is required for notifications"
-        )
-
-    range_lines = "\n".join(
-        [
-            f"- {start.strftime('%Y-%m-%d %H:%M %Z')} -> {end.strftime('%Y-%m-%d %H:%M %Z')}"
-            for start, end in ranges
-        ]
-    )
+    def __enter__(self) -> "SmtpNotifier":
+        return self
 
-    subject = f"Power outage schedule updated: {schedule_day.isoformat()} (Queue {queue})"
-    body = "\n".join(
-        [
-            "Detected schedule update.",
-            f"Date: {schedule_day.isoformat()}",
-            f"Queue: {queue}",
-            f"Source updated at: {updated_at.isoformat()}",
-            "",
-            "Time ranges:",
-            range_lines or "- (no ranges)",
-        ]
-    )
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
 
-    msg = EmailMessage()
-    msg["Subject"] = subject
-    msg["From"] = sender
-    msg["To"] = to_email
-    msg.set_content(body)
-
-    try:
-        if smtp_use_tls:
-            with smtplib.SMTP(smtp_host, smtp_port, timeout=30) as server:
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=30)
+        try:
+            if self.use_tls:
                 server.ehlo()
                 server.starttls()
                 server.ehlo()
-                if smtp_user:
-                    server.login(smtp_user, smtp_password)
-                server.send_message(msg)
-        else:
-            with smtplib.SMTP(smtp_host, smtp_port, timeout=30) as server:
-                if smtp_user:
-                    server.login(smtp_user, smtp_password)
-                server.send_message(msg)
-    except Exception as exc:
-        raise NotificationError(f"Failed to send schedule update email: {exc}") from exc
+            if self.user:
+                server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _disconnect(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            self._server.close()
+        self._server = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+    def send_schedule_update(
+        self,
+        *,
+        to_email: str,
+        from_email: str,
+        schedule_day: date,
+        queue: str,
+        updated_at: datetime,
+        ranges: list[tuple[datetime, datetime]],
+    ) -> None:
+        if not self.host:
+            raise NotificationError("SMTP_HOST is required when NOTIFY_EMAIL_TO is set")
+        if not to_email:
+            raise NotificationError("NOTIFY_EMAIL_TO is required for notifications")
+
+        sender = from_email or self.user
+        if not sender:
+            raise NotificationError(
+                "NOTIFY_EMAIL_FROM or SMTP_USER is required for notifications"
+            )
+
+        range_lines = "\n".join(
+            [
+                f"- {start.strftime('%Y-%m-%d %H:%M %Z')} -> {end.strftime('%Y-%m-%d %H:%M %Z')}"
+                for start, end in ranges
+            ]
+        )
+
+        subject = (
+            f"Power outage schedule updated: {schedule_day.isoformat()} (Queue {queue})"
+        )
+        body = "\n".join(
+            [
+                "Detected schedule update.",
+                f"Date: {schedule_day.isoformat()}",
+                f"Queue: {queue}",
+                f"Source updated at: {updated_at.isoformat()}",
+                "",
+                "Time ranges:",
+                range_lines or "- (no ranges)",
+            ]
+        )
+
+        msg = EmailMessage()
+        msg["Subject"] = subject
+        msg["From"] = sender
+        msg["To"] = to_email
+        msg.set_content(body)
+
+        with self._lock:
+            try:
+                if self._server is None:
+                    self._server = self._connect()
+                self._server.send_message(msg)
+            except Exception as exc:
+                # Reconnect on the next send instead of reusing a broken session.
+                self._disconnect()
+                raise NotificationError(
+                    f"Failed to send schedule update email: {exc}"
+                ) from exc
@@ -4,8 +4,9 @@ from dataclasses import dataclass
 from datetime import date, datetime, time
 from typing import List, Optional
 
-from bs4 import BeautifulSoup
+import lxml.html
 from dateutil import parser as date_parser
+from lxml import etree
 
 TIME_RANGE_RE = re.compile(
     r"(?:з\s*)?(\d{1,2}:\d{2})\s*(?:-|до)\s*(\d{1,2}:\d{2})",
@@ -19,6 +20,31 @@ SCHEDULE_HEADER_RE = re.compile(
     r"графік\s+погодинних\s+відключень\s+на\s+(\d{1,2}[./-]\d{1,2}[./-]\d{2,4})",
     flags=re.IGNORECASE,
 )
+DATE_THEN_TIME_RE = re.compile(
+    r"\b(?P<date>\d{1,2}[./-]\d{1,2}[./-]\d{2,4})[\s\u00a0]+(?P<time>\d{1,2}:\d{2})\b",
+    flags=re.ASCII,
+)
+TIME_THEN_DATE_RE = re.compile(
+    r"\b(?P<time>\d{1,2}:\d{2})[\s\u00a0]+(?P<date>\d{1,2}[./-]\d{1,2}[./-]\d{2,4})\b",
+    flags=re.ASCII,
+)
+CLOCK_TIME_RE = re.compile(r"\b\d{1,2}:\d{2}\b", flags=re.ASCII)
+DATE_SEPARATOR_RE = re.compile(r"[./-]")
+QUEUE_STRIP_CHARS = ".,;: "
+
+# Compiled once: the equivalent of the `.power-off__text` CSS selector, and the
+# visible text nodes of a block (script/style content excluded).
+SCHEDULE_BLOCK_XPATH = etree.XPath(
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' power-off__text ')]"
+)
+BLOCK_TEXT_XPATH = etree.XPath(
+    ".//text()[not(ancestor::script) and not(ancestor::style)]"
+)
+# After networkidle the blocks are normally present; without a schedule the
+# selector never appears, so cap the wait at the old fixed 3 s delay.
+SCHEDULE_WAIT_TIMEOUT_MS = 3000
+# The schedule is plain text in the DOM; none of these are needed to render it.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
 
 
 @dataclass
@@ -41,30 +67,39 @@ class ParseError(Exception):
 
 
 def _normalize_queue(value: str) -> str:
-    return value.strip().strip(".,;: ")
+    return value.strip().strip(QUEUE_STRIP_CHARS)
 
 
 def _parse_time(value: str) -> time:
+    # Callers only pass regex-matched H:MM / HH:MM, so split instead of strptime.
     if value == "24:00":
         return time(0, 0)
-    return datetime.strptime(value, "%H:%M").time()
+    hours, minutes = value.split(":")
+    return time(int(hours), int(minutes))
 
 
-def _pick_update_datetime(text: str, fallback_date: date) -> datetime:
-    datetime_patterns = [
-        r"\b\d{1,2}[./-]\d{1,2}[./-]\d{2,4}\s+\d{1,2}:\d{2}\b",
-        r"\b\d{1,2}:\d{2}\s+\d{1,2}[./-]\d{1,2}[./-]\d{2,4}\b",
-    ]
+def _parse_dmy(value: str) -> date:
+    day, month, year = (int(part) for part in DATE_SEPARATOR_RE.split(value))
+    if year < 100:
+        year += 2000
+    return date(year, month, day)
 
-    for pattern in datetime_patterns:
-        for match in re.finditer(pattern, text):
-            raw = match.group(0)
+
+def _pick_update_datetime(text: str, fallback_date: date) -> datetime:
+    for pattern in (DATE_THEN_TIME_RE, TIME_THEN_DATE_RE):
+        for match in pattern.finditer(text):
             try:
-                return date_parser.parse(raw, dayfirst=True)
+                return datetime.combine(
+                    _parse_dmy(match.group("date")), _parse_time(match.group("time"))
+                )
+            except ValueError:
+                pass
+            try:
+                return date_parser.parse(match.group(0), dayfirst=True)
             except Exception:
                 continue
 
-    time_match = re.search(r"\b\d{1,2}:\d{2}\b", text)
+    time_match = CLOCK_TIME_RE.search(text)
     if time_match:
         t = _parse_time(time_match.group(0))
         return datetime.combine(fallback_date, t)
@@ -93,7 +128,7 @@ def _extract_queue_lines(lines: List[str]) -> List[QueueLine]:
 
 
 def _fingerprint(source: str) -> str:
-    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=16).hexdigest()
 
 
 def _snapshot_from_block(
@@ -119,28 +154,35 @@ def _snapshot_from_block(
     )
 
 
+def _parse_header_date(line: str) -> Optional[date]:
+    m = SCHEDULE_HEADER_RE.search(line)
+    if not m:
+        return None
+    try:
+        return _parse_dmy(m.group(1))
+    except ValueError:
+        pass
+    try:
+        return date_parser.parse(m.group(1), dayfirst=True).date()
+    except Exception:
+        return None
+
+
 def _extract_schedule_blocks_from_html(html: str) -> List[tuple[date, List[str]]]:
-    soup = BeautifulSoup(html, "html.parser")
-    blocks = soup.select(".power-off__text")
+    root = lxml.html.fromstring(html)
+    blocks = SCHEDULE_BLOCK_XPATH(root)
 
     out: List[tuple[date, List[str]]] = []
     for block in blocks:
-        lines = [
-            line.strip() for line in block.stripped_strings if line and line.strip()
-        ]
-        if not lines:
-            continue
-
+        lines: List[str] = []
         header_date: Optional[date] = None
-        for line in lines:
-            m = SCHEDULE_HEADER_RE.search(line)
-            if not m:
-                continue
-            try:
-                header_date = date_parser.parse(m.group(1), dayfirst=True).date()
-                break
-            except Exception:
+        for text in BLOCK_TEXT_XPATH(block):
+            line = text.strip()
+            if not line:
                 continue
+            lines.append(line)
+            if header_date is None:
+                header_date = _parse_header_date(line)
 
         if header_date is None:
             continue
@@ -153,60 +195,124 @@ def _extract_schedule_blocks_from_html(html: str) -> List[tuple[date, List[str]]
     return out
 
 
-def fetch_snapshot_rendered(
-    url: str,
-    chromium_executable: str = "/usr/bin/chromium",
-    launch_timeout_ms: int = 180000,
-) -> List[ScheduleSnapshot]:
-    try:
-        from playwright.sync_api import sync_playwright
-    except Exception as exc:
-        raise ParseError("Playwright is required for JS rendering") from exc
+# Reused across fetches in the same process; see close_browser(). The Docker
+# entrypoint starts a new process per cycle, so there it lives for one fetch.
+_playwright = None
+_browser = None
+_page = None
 
+
+def _launch_browser(p, chromium_executable: str, launch_timeout_ms: int):
     launch_args = [
         "--no-sandbox",
         "--disable-setuid-sandbox",
         "--disable-dev-shm-usage",
         "--disable-gpu",
         "--disable-software-rasterizer",
-        "--no-zygote",
-        "--single-process",
     ]
 
-    with sync_playwright() as p:
+    try:
+        launch_kwargs = {
+            "headless": True,
+            "args": launch_args,
+            "timeout": launch_timeout_ms,
+        }
+        if chromium_executable:
+            launch_kwargs["executable_path"] = chromium_executable
+        return p.chromium.launch(**launch_kwargs)
+    except Exception as first_exc:
+        if chromium_executable:
+            try:
+                return p.chromium.launch(
+                    headless=True,
+                    args=launch_args,
+                    timeout=launch_timeout_ms,
+                )
+            except Exception:
+                raise ParseError(
+                    f"Chromium launch failed for executable '{chromium_executable}'"
+                ) from first_exc
+        raise
+
+
+def _block_heavy_resources(route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _get_page(chromium_executable: str, launch_timeout_ms: int):
+    global _playwright, _browser, _page
+
+    if _page is not None and not _page.is_closed():
+        return _page
+
+    try:
+        from playwright.sync_api import sync_playwright
+    except Exception as exc:
+        raise ParseError("Playwright is required for JS rendering") from exc
+
+    if _browser is None or not _browser.is_connected():
+        if _playwright is None:
+            _playwright = sync_playwright().start()
+        _browser = _launch_browser(_playwright, chromium_executable, launch_timeout_ms)
+
+    _page = _browser.new_page()
+    _page.route("**/*", _block_heavy_resources)
+    return _page
+
+
+def close_browser() -> None:
+    global _playwright, _browser, _page
+
+    _page = None
+    if _browser is not None:
         try:
-            launch_kwargs = {
-                "headless": True,
-                "args": launch_args,
-                "timeout": launch_timeout_ms,
-            }
-            if chromium_executable:
-                launch_kwargs["executable_path"] = chromium_executable
-            browser = p.chromium.launch(**launch_kwargs)
-        except Exception as first_exc:
-            if chromium_executable:
-                try:
-                    browser = p.chromium.launch(
-                        headless=True,
-                        args=launch_args,
-                        timeout=launch_timeout_ms,
-                    )
-                except Exception:
-                    raise ParseError(
-                        f"Chromium launch failed for executable '{chromium_executable}'"
-                    ) from first_exc
-            else:
-                raise
-
-        page = browser.new_page()
+            _browser.close()
+        except Exception:
+            pass
+        _browser = None
+    if _playwright is not None:
+        try:
+            _playwright.stop()
+        except Exception:
+            pass
+        _playwright = None
+
+
+def fetch_rendered_html(
+    url: str,
+    chromium_executable: str = "/usr/bin/chromium",
+    launch_timeout_ms: int = 180000,
+) -> str:
+    page = _get_page(chromium_executable, launch_timeout_ms)
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+    try:
         page.goto(url, wait_until="networkidle", timeout=60000)
-        page.wait_for_timeout(3000)
+        try:
+            page.wait_for_selector(
+                ".power-off__text", state="attached", timeout=SCHEDULE_WAIT_TIMEOUT_MS
+            )
+        except PlaywrightTimeoutError:
+            # Pages without a schedule are reported by the block parser.
+            pass
         html = page.content()
-        browser.close()
+    except Exception:
+        close_browser()
+        raise
 
     if not html or len(html.strip()) < 50:
         raise ParseError("Rendered page HTML is empty; could not read schedule")
+    return html
+
+
+def html_fingerprint(html: str) -> str:
+    return _fingerprint(html)
+
 
+def parse_snapshots(html: str) -> List[ScheduleSnapshot]:
     blocks = _extract_schedule_blocks_from_html(html)
     snapshots = [_snapshot_from_block(day, block_lines) for day, block_lines in blocks]
     if not snapshots:
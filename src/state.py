@@ -1,12 +1,30 @@
-import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
+
+try:
+    import orjson
+
+    def _dumps(data: dict) -> bytes:
+        return orjson.dumps(data)
+
+    def _loads(content: bytes) -> dict:
+        return orjson.loads(content)
+
+except ImportError:
+    import json
+
+    def _dumps(data: dict) -> bytes:
+        return json.dumps(data, ensure_ascii=True).encode("utf-8")
+
+    def _loads(content: bytes) -> dict:
+        return json.loads(content)
 
 
 @dataclass
 class State:
     by_day_fingerprint: Dict[str, str]
+    page_fingerprint: Optional[str] = None
 
 
 def load_state(path: str) -> State:
@@ -14,18 +32,25 @@ def load_state(path: str) -> State:
     if not p.exists():
         return State(by_day_fingerprint={})
 
-    content = p.read_text(encoding="utf-8").strip()
+    content = p.read_bytes().strip()
     if not content:
         return State(by_day_fingerprint={})
 
-    data = json.loads(content)
-    return State(by_day_fingerprint=data.get("by_day_fingerprint", {}))
+    data = _loads(content)
+    return State(
+        by_day_fingerprint=data.get("by_day_fingerprint", {}),
+        page_fingerprint=data.get("page_fingerprint"),
+    )
 
 
 def save_state(path: str, state: State) -> None:
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(
-        json.dumps({"by_day_fingerprint": state.by_day_fingerprint}, ensure_ascii=True),
-        encoding="utf-8",
+    p.write_bytes(
+        _dumps(
+            {
+                "by_day_fingerprint": state.by_day_fingerprint,
+                "page_fingerprint": state.page_fingerprint,
+            }
+        )
     )